@@ -0,0 +1,52 @@
+# Memory per member and creation time of a million small arrays, as
+# separate BitArrays and as members of a BitArrayPool.
+#
+#   python benchmarks/bench_bitarraypool.py
+import time
+import tracemalloc
+
+from bitarray.bitarray import BitArray
+from bitarray.bitarraypool import BitArrayPool
+
+N_MEMBERS = 1_000_000
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, memory / N_MEMBERS
+
+
+def main():
+    for n_bits in (64, 256, 512):
+        _, list_time, list_memory = measure(lambda: [BitArray(n_bits) for _ in range(N_MEMBERS)])
+
+        def make_pool():
+            pool = BitArrayPool(n_bits)
+            pool.allocate(N_MEMBERS)
+            return pool
+
+        pool, pool_time, pool_memory = measure(make_pool)
+        print(
+            f'{n_bits} bits: list of BitArray {list_memory:.0f} B/item {list_time:.3f}s, '
+            f'pool {pool_memory:.0f} B/item {pool_time:.3f}s'
+        )
+
+        mask = BitArray(n_bits)
+        mask[3] = 1
+        start = time.perf_counter()
+        pool.or_mask(mask)
+        or_time = time.perf_counter() - start
+        start = time.perf_counter()
+        counts = pool.counts()
+        count_time = time.perf_counter() - start
+        assert sum(counts) == N_MEMBERS
+        print(f'    or_mask {or_time:.3f}s, counts {count_time:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
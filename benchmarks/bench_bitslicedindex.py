@@ -0,0 +1,43 @@
+# Range queries on a BitSlicedIndex against scanning a python list.
+#
+#   python benchmarks/bench_bitslicedindex.py
+import random
+import time
+
+from bitarray.bitslicedindex import BitSlicedIndex
+
+N_ROWS = 10_000_000
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(0)
+    values = [rng.randrange(1 << 20) for _ in range(N_ROWS)]
+
+    bsi = BitSlicedIndex(values)
+    _, build_time = timed(lambda: bsi.slices)
+    print(f'build {N_ROWS} rows: {build_time:.3f}s')
+
+    queries = [
+        ('x < 1000', lambda: bsi.lt(1000), lambda: [x < 1000 for x in values]),
+        ('1000 <= x <= 500000', lambda: bsi.between(1000, 500_000), lambda: [1000 <= x <= 500_000 for x in values]),
+        ('x == 4242', lambda: bsi.eq(4242), lambda: [x == 4242 for x in values]),
+    ]
+    for name, bsi_query, scan_query in queries:
+        result, bsi_time = timed(bsi_query)
+        expected, scan_time = timed(scan_query)
+        assert result.n_filled == sum(expected)
+        print(f'{name}: bsi {bsi_time:.3f}s, list scan {scan_time:.3f}s, {scan_time / bsi_time:.1f}x')
+
+    _, top_time = timed(bsi.top_k, 100)
+    _, sum_time = timed(bsi.sum)
+    print(f'top_k(100): {top_time:.3f}s, sum: {sum_time:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Write throughput of ConcurrentBitArray across threads.
+#
+#   python benchmarks/bench_concurrentbitarray.py
+#
+# On a GIL build the threads take turns, so this mostly shows the locking
+# overhead; on a free-threaded build (3.13t) writes to different stripes
+# run in parallel and the time should drop as threads are added.
+import random
+import sys
+import threading
+import time
+
+from bitarray.bitarray import BitArray
+from bitarray.concurrentbitarray import ConcurrentBitArray
+
+N_BITS = 1 << 20
+N_WRITES = 400_000
+
+
+def run(ba, n_threads, write):
+    keys = [random.Random(seed).choices(range(N_BITS), k=N_WRITES // n_threads) for seed in range(n_threads)]
+
+    def worker(thread_keys):
+        for key in thread_keys:
+            write(ba, key)
+
+    threads = [threading.Thread(target=worker, args=(thread_keys,)) for thread_keys in keys]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def setitem(ba, key):
+    ba[key] = 1
+
+
+def test_and_set(ba, key):
+    ba.test_and_set(key)
+
+
+def main():
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'python {sys.version.split()[0]}, gil {"enabled" if gil else "disabled"}, {N_WRITES} writes')
+    print(f'BitArray 1 thread (unsafe baseline): {run(BitArray(N_BITS), 1, setitem):.3f}s')
+    for n_threads in (1, 2, 4, 8):
+        setitem_time = run(ConcurrentBitArray(N_BITS), n_threads, setitem)
+        tas_time = run(ConcurrentBitArray(N_BITS), n_threads, test_and_set)
+        print(f'ConcurrentBitArray {n_threads} threads: setitem {setitem_time:.3f}s, test_and_set {tas_time:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# Building a FingerprintIndex over a million 256-bit fingerprints and
+# querying it by scan and by multi-index hashing.
+#
+#   python benchmarks/bench_fingerprint.py
+import random
+import time
+
+from bitarray.frozenbitarray import FrozenBitArray
+from bitarray.fingerprint import FingerprintIndex
+
+N_FINGERPRINTS = 1_000_000
+N_BITS = 256
+N_QUERIES = 20
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(0)
+    fingerprints = [FrozenBitArray(rng.randbytes(N_BITS // 8)) for _ in range(N_FINGERPRINTS)]
+    queries = rng.sample(fingerprints, N_QUERIES)
+    print(f'{N_FINGERPRINTS} fingerprints of {N_BITS} bits')
+
+    index, build_time = timed(FingerprintIndex, N_BITS, fingerprints)
+    print(f'build: {build_time:.3f}s')
+    _, query_time = timed(lambda: [index.query(fp, 10) for fp in queries])
+    print(f'query(fp, 10) full scan: {query_time / N_QUERIES * 1000:.1f}ms per query')
+    _, within_time = timed(lambda: [index.within(fp, 8) for fp in queries])
+    print(f'within(fp, 8) full scan: {within_time / N_QUERIES * 1000:.1f}ms per query')
+
+    for n_segments in (8, 16):
+        mih, build_time = timed(FingerprintIndex, N_BITS, fingerprints, n_segments=n_segments)
+        radius = n_segments - 1
+        results, within_time = timed(lambda: [mih.within(fp, radius) for fp in queries])
+        assert results == [index.within(fp, radius) for fp in queries]
+        print(
+            f'n_segments={n_segments}: build {build_time:.3f}s, '
+            f'within(fp, {radius}) {within_time / N_QUERIES * 1000:.3f}ms per query'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# Deep filter expressions evaluated eagerly and through lazy().
+#
+#   python benchmarks/bench_lazyarray.py
+import random
+import time
+import tracemalloc
+
+from bitarray.bitarray import BitArray
+from bitarray.lazyarray import lazy
+
+N_BITS = 8_000_000
+N_INPUTS = 16
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def filter_expression(arrays):
+    # (a0 & a1) | (a2 & ~a3), or-ed over all groups of four, then and-ed
+    # with the first group again so every input is read more than once
+    groups = [
+        (arrays[i] & arrays[i + 1]) | (arrays[i + 2] & ~arrays[i + 3])
+        for i in range(0, len(arrays), 4)
+    ]
+    result = groups[0]
+    for group in groups[1:]:
+        result = result | group
+    return result & ((arrays[0] & arrays[1]) | (arrays[2] & ~arrays[3]))
+
+
+def main():
+    rng = random.Random(0)
+    arrays = [BitArray(rng.randbytes(N_BITS // 8)) for _ in range(N_INPUTS)]
+    print(f'{N_INPUTS} inputs of {N_BITS} bits ({N_BITS // 8 / 2**20:.1f} MiB each)')
+
+    eager, eager_time, eager_peak = measure(lambda: filter_expression(arrays))
+    count, count_time, count_peak = measure(lambda: filter_expression([lazy(a) for a in arrays]).n_filled)
+    result, lazy_time, lazy_peak = measure(lambda: filter_expression([lazy(a) for a in arrays]).materialize())
+    part, slice_time, slice_peak = measure(lambda: filter_expression([lazy(a) for a in arrays])[:N_BITS // 100])
+    assert count == eager.n_filled
+    assert result == eager
+
+    print(f'eager:              {eager_time:.3f}s, peak {eager_peak:.1f} MiB')
+    print(f'lazy n_filled:      {count_time:.3f}s, peak {count_peak:.1f} MiB')
+    print(f'lazy materialize(): {lazy_time:.3f}s, peak {lazy_peak:.1f} MiB')
+    print(f'lazy first 1%:      {slice_time:.3f}s, peak {slice_peak:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
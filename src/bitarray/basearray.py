@@ -4,6 +4,7 @@ from bitarray.utils import list_repr
 
 
 class BaseArray:
+    __slots__ = ('_bytes', '_n_bits', '_n_filled')
     buffer_func = bytearray
 
     def __init__(self, initializer=None, n_bits=None):
@@ -26,15 +27,15 @@ class BaseArray:
                 n_bytes += 1
             self._bytes = self.buffer_func(int(initializer[i:i+8][::-1], 2) for i in range(0, len(initializer), 8))
             self._n_bits = len(initializer)
-            self._n_filled = sum(byte.bit_count() for byte in self._bytes)
+            self._n_filled = toint(self._bytes).bit_count()
         else:
             self._bytes = self.buffer_func(initializer)
             self._n_bits = n_bits if n_bits is not None else len(self._bytes) * 8
-            self._n_filled = sum(byte.bit_count() for byte in self._bytes)
+            self._n_filled = toint(self._bytes).bit_count()
 
 
     def is_full(self) -> bool:
-        if self._n_filled == self._n_bits:
+        if self.n_filled == self._n_bits:
             return True
         return False
     
@@ -56,7 +57,7 @@ class BaseArray:
         if isinstance(key, slice):
             bitslice = getbitslice(key, self._n_bits)
             bytes_ = self._bytes[bitslice.start_byte:bitslice.end_byte]
-            cls = type(self)
+            cls = self._detached_type()
             bitstring = ''.join(
                 str(bit)
                 for bit in bytes_iter(bytes_)
@@ -70,27 +71,44 @@ class BaseArray:
 
 
     def __eq__(self, value) -> bool:
+        if not isinstance(value, BaseArray):
+            return NotImplemented
         return self._bytes == value._bytes
 
 
     def __and__(self, value):
-        return type(self)(
-            (
-                b1 & b2
-                for b1, b2 in zip(self._bytes, value._bytes)
-            ),
-            n_bits=self._n_bits,
-        )
+        if not isinstance(value, BaseArray):
+            return NotImplemented
+        return self._from_int(toint(self._bytes) & toint(value._bytes))
 
     
     def __or__(self, value):
-        return type(self)(
-            (
-                b1 | b2
-                for b1, b2 in zip(self._bytes, value._bytes)
-            ),
-            n_bits=self._n_bits,
-        )
+        if not isinstance(value, BaseArray):
+            return NotImplemented
+        return self._from_int(toint(self._bytes) | toint(value._bytes))
+
+
+    def __xor__(self, value):
+        if not isinstance(value, BaseArray):
+            return NotImplemented
+        return self._from_int(toint(self._bytes) ^ toint(value._bytes))
+
+
+    def __invert__(self):
+        return self._from_int(~toint(self._bytes))
+
+
+    def _from_int(self, value: int):
+        # value is the result in the bit order of toint, ~ sets the bits
+        # past n_bits, so they are dropped
+        value &= (1 << self._n_bits) - 1
+        return self._detached_type()(value.to_bytes(len(self._bytes), 'little'), n_bits=self._n_bits)
+
+
+    def _detached_type(self) -> type:
+        # class of new arrays computed from this one, views into
+        # shared memory return a class that owns its bytes
+        return type(self)
 
 
     def __buffer__(self, flags):
@@ -102,7 +120,7 @@ class BaseArray:
         cls = self.__class__.__name__
         if len(self) < 6:
             return f'{cls}({bits})'
-        return f'{cls}(nb={len(self)}, nf={self._n_filled}, bits={bits})'
+        return f'{cls}(nb={len(self)}, nf={self.n_filled}, bits={bits})'
 
 
     def __str__(self):
@@ -187,6 +205,13 @@ def setbytebit(byte: Byte, bit_idx: int, value: Bit) -> tuple[Byte, int]:
     return (byte, ones_balance)
 
 
+def toint(bytes_: Bytes) -> int:
+    # bytes as one little endian int, bit i of the int is bit i of the
+    # bytes, so whole array bitwise operators and popcounts are single
+    # big int operations instead of python loops over bytes
+    return int.from_bytes(bytes_, 'little')
+
+
 def get_idxs(key: int) -> tuple[int, int]:
     return divmod(key, 8)
 
@@ -3,6 +3,7 @@ from bitarray.basearray import BaseArray
 
 
 class BitArray(BaseArray):
+    __slots__ = ()
     buffer_func = bytearray
 
     def __setitem__(self, key: int | slice, value: int) -> None:
@@ -0,0 +1,142 @@
+import operator
+from itertools import batched
+
+from bitarray.basearray import BaseArray, toint
+from bitarray.bitarray import BitArray
+
+
+class PoolBitArray(BitArray):
+    # a view of one member of a BitArrayPool, _bytes is a memoryview
+    # into the pool chunk, so writes go straight to the pool
+    __slots__ = ()
+
+    @property
+    def n_filled(self):
+        # counted on read, bulk pool operations change the bits underneath
+        return toint(self._bytes).bit_count()
+
+
+    def _detached_type(self) -> type:
+        return BitArray
+
+
+class BitArrayPool:
+    def __init__(self, n_bits: int, chunk_size: int = 65536) -> None:
+        if n_bits <= 0:
+            raise ValueError('n_bits must be positive')
+        if chunk_size <= 0:
+            raise ValueError('chunk_size must be positive')
+        self._n_bits = n_bits
+        self._stride = (n_bits + 7) // 8
+        self._chunk_size = chunk_size
+        # members are packed stride bytes apart in fixed size chunks, a chunk
+        # is never resized so views into it stay valid while the pool grows
+        self._chunks = []
+        self._views = []
+        self._size = 0
+
+
+    @property
+    def n_bits(self) -> int:
+        return self._n_bits
+
+
+    def allocate(self, n: int) -> range:
+        if n < 0:
+            raise ValueError('n must be non-negative')
+        start = self._size
+        self._size += n
+        while len(self._chunks) * self._chunk_size < self._size:
+            chunk = bytearray(self._chunk_size * self._stride)
+            self._chunks.append(chunk)
+            self._views.append(memoryview(chunk))
+        return range(start, self._size)
+
+
+    def add(self, initializer: BaseArray | None = None) -> int:
+        if initializer is not None and len(initializer) != self._n_bits:
+            raise ValueError(f'array must have {self._n_bits} bits, got {len(initializer)}')
+        idx = self.allocate(1)[0]
+        if initializer is not None:
+            self._member_bytes(idx)[:] = initializer._bytes[:self._stride]
+        return idx
+
+
+    def or_mask(self, mask: BaseArray) -> None:
+        self._apply(mask, operator.or_)
+
+
+    def and_mask(self, mask: BaseArray) -> None:
+        self._apply(mask, operator.and_)
+
+
+    def xor_mask(self, mask: BaseArray) -> None:
+        self._apply(mask, operator.xor)
+
+
+    def counts(self) -> list[int]:
+        counts = []
+        stride = self._stride
+        for chunk_idx, view in enumerate(self._views):
+            n_bytes = self._chunk_used(chunk_idx) * stride
+            if stride % 8 == 0:
+                # popcount does not care about byte order, so native words will do
+                words = [word.bit_count() for word in view[:n_bytes].cast('Q')]
+                if stride == 8:
+                    counts.extend(words)
+                else:
+                    counts.extend(map(sum, batched(words, stride // 8)))
+            else:
+                counts.extend(
+                    toint(view[start:start + stride]).bit_count()
+                    for start in range(0, n_bytes, stride)
+                )
+        return counts
+
+
+    def _apply(self, mask: BaseArray, op) -> None:
+        if len(mask) != self._n_bits:
+            raise ValueError(f'mask must have {self._n_bits} bits, got {len(mask)}')
+        mask_bytes = bytes(mask._bytes[:self._stride])
+        for chunk_idx, view in enumerate(self._views):
+            n_members = self._chunk_used(chunk_idx)
+            n_bytes = n_members * self._stride
+            # the mask repeated once per member, one big int operation per chunk
+            value = op(toint(view[:n_bytes]), toint(mask_bytes * n_members))
+            view[:n_bytes] = value.to_bytes(n_bytes, 'little')
+
+
+    def _chunk_used(self, chunk_idx: int) -> int:
+        return min(self._chunk_size, self._size - chunk_idx * self._chunk_size)
+
+
+    def _member_bytes(self, key: int) -> memoryview:
+        chunk_idx, offset = divmod(key, self._chunk_size)
+        start = offset * self._stride
+        return self._views[chunk_idx][start:start + self._stride]
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+    def __getitem__(self, key: int) -> PoolBitArray:
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError(f'{self.__class__.__name__} index out of range')
+        member = PoolBitArray.__new__(PoolBitArray)
+        member._bytes = self._member_bytes(key)
+        member._n_bits = self._n_bits
+        # only kept for BitArray.__setitem__, n_filled counts the bytes
+        member._n_filled = 0
+        return member
+
+
+    def __iter__(self):
+        for key in range(self._size):
+            yield self[key]
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(nb={self._n_bits}, n={self._size})'
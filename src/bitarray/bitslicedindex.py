@@ -0,0 +1,225 @@
+import sys
+from array import array
+from typing import Iterable, Sequence
+
+from bitarray.basearray import toint
+from bitarray.bitarray import BitArray
+from bitarray.memoryview import transpose_packed
+
+
+class BitSlicedIndex:
+    def __init__(self, values: Sequence[int | None] | None = None) -> None:
+        self._n_rows = 0
+        # the bitmaps are kept as ints in the bit order of toint, so a query
+        # is a handful of big int operations per slice without the copy and
+        # popcount every BitArray operator pays for its result.
+        # slice i has bit r set when bit i of the value in row r is set
+        self._slice_ints = []
+        # rows holding a value, None rows are kept as 0 with no existence bit
+        self._ebm_int = 0
+        # appended values not merged into the slices yet
+        self._pending = []
+        if values is not None:
+            self.extend(values)
+
+
+    @property
+    def slices(self) -> list[BitArray]:
+        # new arrays every time, writing to one cannot change the index
+        self._flush()
+        return [self._result(bits) for bits in self._slice_ints]
+
+
+    @property
+    def ebm(self) -> BitArray:
+        self._flush()
+        return self._result(self._ebm_int)
+
+
+    def append(self, value: int | None) -> None:
+        check_value(value)
+        self._pending.append(value)
+
+
+    def extend(self, values: Iterable[int | None]) -> None:
+        values = list(values)
+        for value in values:
+            check_value(value)
+        self._pending.extend(values)
+
+
+    def eq(self, value: int) -> BitArray:
+        _, eq, _ = self._compare(value)
+        return self._result(eq)
+
+
+    def ne(self, value: int) -> BitArray:
+        lt, _, gt = self._compare(value)
+        return self._result(lt | gt)
+
+
+    def lt(self, value: int) -> BitArray:
+        lt, _, _ = self._compare(value)
+        return self._result(lt)
+
+
+    def le(self, value: int) -> BitArray:
+        lt, eq, _ = self._compare(value)
+        return self._result(lt | eq)
+
+
+    def gt(self, value: int) -> BitArray:
+        _, _, gt = self._compare(value)
+        return self._result(gt)
+
+
+    def ge(self, value: int) -> BitArray:
+        _, eq, gt = self._compare(value)
+        return self._result(gt | eq)
+
+
+    def between(self, low: int, high: int) -> BitArray:
+        low_lt, _, _ = self._compare(low)
+        _, _, high_gt = self._compare(high)
+        # both are subsets of ebm, so xor with their union removes them
+        return self._result(self._ebm_int ^ (low_lt | high_gt))
+
+
+    def top_k(self, k: int) -> BitArray:
+        self._flush()
+        found = self._ebm_int
+        if k <= 0:
+            return self._result(0)
+        if found.bit_count() <= k:
+            return self._result(found)
+        # o'neil & quass: walk the slices from the most significant one,
+        # greater holds rows surely in the top k, equal the rows still tied
+        greater, equal = 0, found
+        for bits in reversed(self._slice_ints):
+            common = equal & bits
+            candidate = greater | common
+            count = candidate.bit_count()
+            if count > k:
+                equal = common
+            elif count < k:
+                greater = candidate
+                equal ^= common
+            else:
+                return self._result(candidate)
+        # the rest of equal are ties, take the ones with the lowest row ids
+        return self._result(greater | lowest_bits(equal, k - greater.bit_count()))
+
+
+    def sum(self, bitmap: BitArray | None = None) -> int:
+        self._flush()
+        rows = self._ebm_int
+        if bitmap is not None:
+            rows &= toint(bitmap._bytes)
+        return sum(
+            (bits & rows).bit_count() << i
+            for i, bits in enumerate(self._slice_ints)
+        )
+
+
+    def _compare(self, value: int) -> tuple[int, int, int]:
+        # rows less than, equal to and greater than value, as ints
+        self._flush()
+        if not isinstance(value, int):
+            raise TypeError(f'BitSlicedIndex values are ints, got {type(value).__name__}')
+        found = self._ebm_int
+        if value < 0:
+            return 0, 0, found
+        if value.bit_length() > len(self._slice_ints):
+            return found, 0, 0
+        lt, eq, gt = 0, found, 0
+        for i in range(len(self._slice_ints) - 1, -1, -1):
+            # eq ^ common is eq & ~bits without a negative int
+            common = eq & self._slice_ints[i]
+            if (value >> i) & 1:
+                lt |= eq ^ common
+                eq = common
+            else:
+                gt |= common
+                eq ^= common
+        return lt, eq, gt
+
+
+    def _result(self, value: int) -> BitArray:
+        value &= (1 << self._n_rows) - 1
+        return BitArray(value.to_bytes((self._n_rows + 7) // 8, 'little'), n_bits=self._n_rows)
+
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return None
+        pending = self._pending
+        width = max(max((value or 0).bit_length() for value in pending), len(self._slice_ints))
+        new_slices = slice_ints([value or 0 for value in pending], width)
+        exists = transpose_packed(bytes(value is not None for value in pending), 1, 1)[0]
+
+        # new rows go after the existing ones, slices missing so far are all 0
+        shift = self._n_rows
+        old_slices = self._slice_ints + [0] * (width - len(self._slice_ints))
+        self._slice_ints = [
+            old | (new << shift) if new else old
+            for old, new in zip(old_slices, new_slices)
+        ]
+        self._ebm_int |= exists << shift
+        self._n_rows += len(pending)
+        # only dropped once merged, a failure above leaves them pending
+        self._pending = []
+        return None
+
+
+    def __len__(self) -> int:
+        return self._n_rows + len(self._pending)
+
+
+    def __getitem__(self, key: int) -> int | None:
+        self._flush()
+        if key < 0:
+            key += self._n_rows
+        if not 0 <= key < self._n_rows:
+            raise IndexError(f'{self.__class__.__name__} index out of range')
+        if not (self._ebm_int >> key) & 1:
+            return None
+        return sum(((bits >> key) & 1) << i for i, bits in enumerate(self._slice_ints))
+
+
+    def __repr__(self) -> str:
+        self._flush()
+        return f'{self.__class__.__name__}(n={len(self)}, bits={len(self._slice_ints)})'
+
+
+def check_value(value: int | None) -> None:
+    if value is None:
+        return None
+    if not isinstance(value, int):
+        raise TypeError(f'BitSlicedIndex values are ints, got {type(value).__name__}')
+    if value < 0:
+        raise ValueError('BitSlicedIndex values must be non-negative')
+
+
+def slice_ints(values: Sequence[int], width: int) -> list[int]:
+    # pack every value into the same number of little endian bytes,
+    # then one transpose turns rows of values into one int per bit
+    if width <= 64:
+        packed = array('Q', values)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return transpose_packed(packed.tobytes(), 8, width)
+    row_bytes = (width + 7) // 8
+    packed = b''.join(value.to_bytes(row_bytes, 'little') for value in values)
+    return transpose_packed(packed, row_bytes, width)
+
+
+def lowest_bits(value: int, n: int) -> int:
+    # the n lowest set bits of value, found by binary search over a prefix mask
+    low, high = 0, value.bit_length()
+    while low < high:
+        mid = (low + high) // 2
+        if (value & ((1 << mid) - 1)).bit_count() < n:
+            low = mid + 1
+        else:
+            high = mid
+    return value & ((1 << low) - 1)
@@ -0,0 +1,111 @@
+import threading
+from contextlib import ExitStack
+from typing import Iterable
+
+from bitarray.basearray import getbit, setbit, setbitslice, get_idxs
+from bitarray.bitarray import BitArray
+
+
+class ConcurrentBitArray(BitArray):
+    __slots__ = ('_stripe_bytes', '_locks', '_counts')
+
+    def __init__(self, initializer=None, n_bits=None, stripe_bytes: int = 64, n_stripes: int = 64):
+        super().__init__(initializer, n_bits)
+        if stripe_bytes <= 0 or n_stripes <= 0:
+            raise ValueError('stripe_bytes and n_stripes must be positive')
+        # byte i is guarded by lock (i // stripe_bytes) % n_stripes,
+        # the ones in all bytes guarded by a lock are counted next to it,
+        # in a one item list of its own, so writers on different stripes
+        # never write to the same object
+        self._stripe_bytes = stripe_bytes
+        self._locks = [threading.Lock() for _ in range(n_stripes)]
+        self._counts = [[count] for count in stripe_counts(self._bytes, stripe_bytes, n_stripes)]
+
+
+    @property
+    def n_filled(self):
+        # merged on read, writers only ever touch their own stripe counter
+        return sum(count for count, in self._counts)
+
+
+    def __setitem__(self, key: int | slice, value: int) -> None:
+        if isinstance(key, slice):
+            with self._all_locks():
+                setbitslice(self._bytes, key, memoryview(value), self._n_bits)
+                counts = stripe_counts(self._bytes, self._stripe_bytes, len(self._locks))
+                for counter, count in zip(self._counts, counts):
+                    counter[0] = count
+            return None
+
+        key = self._check_key(key)
+        if value != 0 and value != 1:
+            raise ValueError("It is a bit array, value can only be set to 0 or 1.")
+
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            self._counts[stripe][0] += setbit(self._bytes, key, value)
+        return None
+
+
+    def test_and_set(self, key: int) -> int:
+        return self._test_and_write(key, 1)
+
+
+    def test_and_clear(self, key: int) -> int:
+        return self._test_and_write(key, 0)
+
+
+    def update(self, items: Iterable[tuple[int, int]]) -> None:
+        # group the writes by stripe, so each lock is taken once per batch
+        by_stripe = {}
+        for key, value in items:
+            key = self._check_key(key)
+            if value != 0 and value != 1:
+                raise ValueError("It is a bit array, value can only be set to 0 or 1.")
+            by_stripe.setdefault(self._stripe(key), []).append((key, value))
+
+        for stripe in sorted(by_stripe):
+            with self._locks[stripe]:
+                ones_balance = 0
+                for key, value in by_stripe[stripe]:
+                    ones_balance += setbit(self._bytes, key, value)
+                self._counts[stripe][0] += ones_balance
+
+
+    def _test_and_write(self, key: int, value: int) -> int:
+        key = self._check_key(key)
+        stripe = self._stripe(key)
+        with self._locks[stripe]:
+            old = getbit(self._bytes, key)
+            if old != value:
+                self._counts[stripe][0] += setbit(self._bytes, key, value)
+        return old
+
+
+    def _check_key(self, key: int) -> int:
+        if key < 0:
+            key += self._n_bits
+        if not 0 <= key < self._n_bits:
+            raise IndexError("bit array index out of range")
+        return key
+
+
+    def _stripe(self, key: int) -> int:
+        byte_idx, _ = get_idxs(key)
+        return (byte_idx // self._stripe_bytes) % len(self._locks)
+
+
+    def _all_locks(self) -> ExitStack:
+        # always acquired in the same order, so two slice writers cannot deadlock
+        stack = ExitStack()
+        for lock in self._locks:
+            stack.enter_context(lock)
+        return stack
+
+
+def stripe_counts(bytes_, stripe_bytes: int, n_stripes: int) -> list[int]:
+    counts = [0] * n_stripes
+    for start in range(0, len(bytes_), stripe_bytes):
+        stripe = (start // stripe_bytes) % n_stripes
+        counts[stripe] += int.from_bytes(bytes_[start:start + stripe_bytes]).bit_count()
+    return counts
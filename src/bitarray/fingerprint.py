@@ -0,0 +1,210 @@
+import heapq
+import sys
+from array import array
+from typing import Iterable
+
+from bitarray.basearray import BaseArray, toint
+from bitarray.frozenbitarray import FrozenBitArray
+
+# fingerprints xored with the query together in one scan step
+SCAN_RECORDS = 1 << 12
+# number of ones in every byte value
+POPCOUNT = bytes(i.bit_count() for i in range(256))
+
+
+def hamming(a: BaseArray, b: BaseArray) -> int:
+    check_same_length(a, b)
+    return (toint(a._bytes) ^ toint(b._bytes)).bit_count()
+
+
+def jaccard(a: BaseArray, b: BaseArray) -> float:
+    check_same_length(a, b)
+    a_int, b_int = toint(a._bytes), toint(b._bytes)
+    union = (a_int | b_int).bit_count()
+    if union == 0:
+        # two empty sets are identical
+        return 1.0
+    return (a_int & b_int).bit_count() / union
+
+
+class FingerprintIndex:
+    def __init__(
+        self,
+        n_bits: int,
+        fingerprints: Iterable[BaseArray] | None = None,
+        n_segments: int | None = None,
+    ) -> None:
+        if n_bits <= 0:
+            raise ValueError('n_bits must be positive')
+        if n_segments is not None and not 0 < n_segments <= n_bits:
+            raise ValueError(f'n_segments must be in range(1, {n_bits + 1})')
+        self._n_bits = n_bits
+        self._n_bytes = (n_bits + 7) // 8
+        # fingerprints packed _n_bytes apart, the only copy kept
+        self._bytes = bytearray()
+        self._segments = make_segments(n_bits, n_segments) if n_segments else None
+        self._tables = [{} for _ in self._segments] if self._segments else None
+        if fingerprints is not None:
+            self.extend(fingerprints)
+
+
+    @property
+    def n_bits(self) -> int:
+        return self._n_bits
+
+
+    def add(self, fingerprint: BaseArray) -> int:
+        idx = len(self)
+        self.extend([fingerprint])
+        return idx
+
+
+    def extend(self, fingerprints: Iterable[BaseArray]) -> None:
+        start = len(self)
+        packed = b''.join(self._fingerprint_bytes(fingerprint) for fingerprint in fingerprints)
+        self._bytes += packed
+        if self._tables is None:
+            return None
+        n_bytes = self._n_bytes
+        values = [toint(packed[i:i + n_bytes]) for i in range(0, len(packed), n_bytes)]
+        # one table at a time, a segment value seen once maps to its index,
+        # only values seen more than once pay for a list
+        for table, (shift, mask) in zip(self._tables, self._segments):
+            for idx, value in enumerate(values, start):
+                key = (value >> shift) & mask
+                bucket = table.get(key)
+                if bucket is None:
+                    table[key] = idx
+                elif type(bucket) is int:
+                    table[key] = [bucket, idx]
+                else:
+                    bucket.append(idx)
+        return None
+
+
+    def distances(self, fingerprint: BaseArray) -> list[int]:
+        query = self._fingerprint_bytes(fingerprint)
+        n_bytes = self._n_bytes
+        step = SCAN_RECORDS * n_bytes
+        view = memoryview(self._bytes)
+        repeated = toint(query * SCAN_RECORDS)
+        dists = []
+        for start in range(0, len(view), step):
+            chunk = view[start:start + step]
+            if len(chunk) < step:
+                repeated = toint(query * (len(chunk) // n_bytes))
+            # one xor over the whole chunk, then the ones of every byte
+            diff = (toint(chunk) ^ repeated).to_bytes(len(chunk), 'little')
+            dists.extend(record_sums(diff.translate(POPCOUNT), n_bytes))
+        return dists
+
+
+    def query(self, fingerprint: BaseArray, k: int) -> list[tuple[int, int]]:
+        dists = self.distances(fingerprint)
+        nearest = heapq.nsmallest(k, zip(dists, range(len(dists))))
+        return [(idx, dist) for dist, idx in nearest]
+
+
+    def within(self, fingerprint: BaseArray, radius: int) -> list[tuple[int, int]]:
+        value = toint(self._fingerprint_bytes(fingerprint))
+        if self._tables is not None and radius < len(self._tables):
+            # pigeonhole: with more segments than allowed differing bits,
+            # every match agrees exactly with the query on some segment
+            candidates = set()
+            for table, (shift, mask) in zip(self._tables, self._segments):
+                bucket = table.get((value >> shift) & mask)
+                if type(bucket) is int:
+                    candidates.add(bucket)
+                elif bucket is not None:
+                    candidates.update(bucket)
+            view, n_bytes = memoryview(self._bytes), self._n_bytes
+            matches = (
+                (idx, (value ^ toint(view[idx * n_bytes:(idx + 1) * n_bytes])).bit_count())
+                for idx in sorted(candidates)
+            )
+            return [(idx, dist) for idx, dist in matches if dist <= radius]
+        return [
+            (idx, dist)
+            for idx, dist in enumerate(self.distances(fingerprint))
+            if dist <= radius
+        ]
+
+
+    def _fingerprint_bytes(self, fingerprint: BaseArray) -> bytes:
+        if len(fingerprint) != self._n_bits:
+            raise ValueError(f'fingerprint must have {self._n_bits} bits, got {len(fingerprint)}')
+        return bytes(fingerprint._bytes[:self._n_bytes])
+
+
+    def __len__(self) -> int:
+        return len(self._bytes) // self._n_bytes
+
+
+    def __getitem__(self, key: int) -> FrozenBitArray:
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(f'{self.__class__.__name__} index out of range')
+        start = key * self._n_bytes
+        return FrozenBitArray(self._bytes[start:start + self._n_bytes], n_bits=self._n_bits)
+
+
+    def __buffer__(self, flags):
+        return self._bytes.__buffer__(flags)
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(nb={self._n_bits}, n={len(self)})'
+
+
+def check_same_length(a: BaseArray, b: BaseArray) -> None:
+    if len(a) != len(b):
+        raise ValueError(f'arrays must have the same length, got {len(a)} and {len(b)}')
+
+
+def record_sums(counts: bytes, n_bytes: int) -> list[int]:
+    # sums of every n_bytes consecutive counts, one per record
+    if n_bytes * 8 >= 1 << 16:
+        return [sum(counts[i:i + n_bytes]) for i in range(0, len(counts), n_bytes)]
+    # byte i of window is the sum of counts i:i + size, up to 16 counts
+    # the sum is at most 128, so the doubling never carries into the next
+    # byte. a record is covered by windows at increasing offsets, each one
+    # is picked out for every record with an extended slice
+    top = min(16, 1 << (n_bytes.bit_length() - 1))
+    n_top, rest = divmod(n_bytes, top)
+    window, size, offset = toint(counts), 1, 0
+    pieces = []
+    while size < top:
+        if rest & size:
+            pieces.append(window.to_bytes(len(counts), 'little')[offset::n_bytes])
+            offset += size
+        window += window >> (8 * size)
+        size *= 2
+    window = window.to_bytes(len(counts), 'little')
+    pieces.extend(window[offset + i * top::n_bytes] for i in range(n_top))
+    if len(pieces) == 1:
+        return list(pieces[0])
+    # the pieces are added in 16 bit lanes, which hold any record sum
+    total = 0
+    for piece in pieces:
+        wide = bytearray(2 * len(piece))
+        wide[::2] = piece
+        total += toint(wide)
+    lanes = array('H')
+    lanes.frombytes(total.to_bytes(2 * len(pieces[0]), 'little'))
+    if sys.byteorder == 'big':
+        lanes.byteswap()
+    return lanes.tolist()
+
+
+def make_segments(n_bits: int, n_segments: int) -> list[tuple[int, int]]:
+    # split n_bits into n_segments contiguous (shift, mask) pairs
+    # whose widths differ by at most one bit
+    width, rem = divmod(n_bits, n_segments)
+    segments = []
+    shift = 0
+    for i in range(n_segments):
+        seg_width = width + 1 if i < rem else width
+        segments.append((shift, (1 << seg_width) - 1))
+        shift += seg_width
+    return segments
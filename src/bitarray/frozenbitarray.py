@@ -2,6 +2,7 @@ from bitarray.basearray import BaseArray
 
 
 class FrozenBitArray(BaseArray):
+    __slots__ = ()
     buffer_func = bytes
 
     def __hash__(self) -> int:
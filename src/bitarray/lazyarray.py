@@ -0,0 +1,235 @@
+import operator
+
+from bitarray.basearray import BaseArray, toint, bytes_iter
+
+# bytes of every input evaluated together, intermediates never get bigger
+CHUNK_BYTES = 1 << 16
+
+OPERATORS = {
+    'and': operator.and_,
+    'or': operator.or_,
+    'xor': operator.xor,
+}
+
+
+def lazy(arr: 'BaseArray | LazyArray') -> 'LazyArray':
+    if isinstance(arr, LazyArray):
+        return arr
+    if not isinstance(arr, BaseArray):
+        raise TypeError(f'lazy() takes a BaseArray, got {type(arr).__name__}')
+    return LazyArray('leaf', (arr,), len(arr))
+
+
+class LazyArray:
+    # a node of a bitwise expression over BaseArrays, nothing is computed
+    # until bits, n_filled, iteration or materialize() are asked for, and
+    # then the whole expression is evaluated in one chunked pass
+    __slots__ = ('_op', '_operands', '_n_bits')
+
+    def __init__(self, op: str, operands: tuple, n_bits: int) -> None:
+        self._op = op
+        self._operands = operands
+        self._n_bits = n_bits
+
+
+    def __and__(self, value):
+        return self._binary('and', value, False)
+
+
+    def __rand__(self, value):
+        return self._binary('and', value, True)
+
+
+    def __or__(self, value):
+        return self._binary('or', value, False)
+
+
+    def __ror__(self, value):
+        return self._binary('or', value, True)
+
+
+    def __xor__(self, value):
+        return self._binary('xor', value, False)
+
+
+    def __rxor__(self, value):
+        return self._binary('xor', value, True)
+
+
+    def __invert__(self):
+        return LazyArray('not', (self,), self._n_bits)
+
+
+    def __eq__(self, value) -> bool:
+        # compares the evaluated bits, like BaseArray does
+        if isinstance(value, LazyArray):
+            value = value.materialize()
+        elif not isinstance(value, BaseArray):
+            return NotImplemented
+        return self.materialize() == value
+
+
+    # leaves are mutable, so an expression has no stable hash
+    __hash__ = None
+
+
+    @property
+    def n_filled(self) -> int:
+        leaves, program = self._compile()
+        return sum(
+            value.bit_count()
+            for _, _, value in self._evaluate(leaves, program, 0, (self._n_bits + 7) // 8)
+        )
+
+
+    def is_full(self) -> bool:
+        return self.n_filled == self._n_bits
+
+
+    def materialize(self) -> BaseArray:
+        leaves, program = self._compile()
+        n_bytes = (self._n_bits + 7) // 8
+        result = self._evaluate_bytes(leaves, program, 0, n_bytes)
+        return leaves[0]._detached_type()(result, n_bits=self._n_bits)
+
+
+    def __len__(self) -> int:
+        return self._n_bits
+
+
+    def __iter__(self):
+        leaves, program = self._compile()
+        bits_left = self._n_bits
+        for start, end, value in self._evaluate(leaves, program, 0, (self._n_bits + 7) // 8):
+            take_n_bits = min(bits_left, (end - start) * 8)
+            yield from bytes_iter(value.to_bytes(end - start, 'little'), take_n_bits)
+            bits_left -= take_n_bits
+
+
+    def __getitem__(self, key: int | slice):
+        if isinstance(key, slice):
+            return self._getslice(key)
+        if key < 0:
+            key += self._n_bits
+        if not 0 <= key < self._n_bits:
+            raise IndexError(f'{self.__class__.__name__} index out of range')
+        # only the byte holding the bit is evaluated
+        leaves, program = self._compile()
+        byte_idx, bit_idx = divmod(key, 8)
+        (_, _, value), = self._evaluate(leaves, program, byte_idx, byte_idx + 1)
+        return (value >> bit_idx) & 1
+
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(op={self._op}, nb={self._n_bits})'
+
+
+    def _binary(self, op: str, value, reflected: bool):
+        if isinstance(value, BaseArray):
+            value = lazy(value)
+        elif not isinstance(value, LazyArray):
+            return NotImplemented
+        if len(value) != self._n_bits:
+            raise ValueError(f'arrays must have the same length, got {self._n_bits} and {len(value)}')
+        operands = (value, self) if reflected else (self, value)
+        return LazyArray(op, operands, self._n_bits)
+
+
+    def _getslice(self, key: slice) -> BaseArray:
+        indices = range(*key.indices(self._n_bits))
+        leaves, program = self._compile()
+        cls = leaves[0]._detached_type()
+        if not indices:
+            return cls()
+        low, high = (indices[0], indices[-1] + 1) if indices.step > 0 else (indices[-1], indices[0] + 1)
+        # only the bytes covering the slice are evaluated
+        start_byte = low // 8
+        result = self._evaluate_bytes(leaves, program, start_byte, (high + 7) // 8)
+        value = toint(result) >> (low - start_byte * 8)
+        if indices.step == 1:
+            n_bits = high - low
+            value &= (1 << n_bits) - 1
+            return cls(value.to_bytes((n_bits + 7) // 8, 'little'), n_bits=n_bits)
+        bits = format(value, f'0{high - low}b')[::-1]
+        return cls(''.join(bits[i - low] for i in indices))
+
+
+    def _evaluate_bytes(self, leaves: list[BaseArray], program: list, start_byte: int, end_byte: int) -> bytearray:
+        result = bytearray(end_byte - start_byte)
+        for start, end, value in self._evaluate(leaves, program, start_byte, end_byte):
+            result[start - start_byte:end - start_byte] = value.to_bytes(end - start, 'little')
+        return result
+
+
+    def _evaluate(self, leaves: list[BaseArray], program: list, start_byte: int, end_byte: int):
+        # runs a compiled program, yields (start, end, value) for every chunk
+        # of bytes, value holds the result bits of bytes start:end as an int
+        buffers = [memoryview(leaf._bytes) for leaf in leaves]
+        last_bit = self._n_bits
+        for start in range(start_byte, end_byte, CHUNK_BYTES):
+            end = min(start + CHUNK_BYTES, end_byte)
+            ones = (1 << ((end - start) * 8)) - 1
+            registers = [toint(buffer[start:end]) for buffer in buffers]
+            for op, left, right in program:
+                if op == 'not':
+                    # xor with ones is ~ without a negative int
+                    registers.append(registers[left] ^ ones)
+                else:
+                    registers.append(OPERATORS[op](registers[left], registers[right]))
+            value = registers[-1]
+            if end * 8 > last_bit:
+                value &= (1 << (last_bit - start * 8)) - 1
+            yield start, end, value
+
+
+    def _compile(self) -> tuple[list[BaseArray], list[tuple[str, int, int | None]]]:
+        # flattens the tree into registers: first one per distinct leaf array,
+        # then one instruction per distinct subexpression, so anything shared
+        # is computed once per chunk, the last register is the result
+        leaves = []
+        program = []
+        # (op, operand registers) or ('leaf', id(array)) -> register
+        registers = {}
+        # id(node) -> register, for nodes already compiled
+        compiled = {}
+        stack = [(self, False)]
+        while stack:
+            node, ready = stack.pop()
+            if id(node) in compiled:
+                continue
+            if node._op == 'leaf':
+                signature = ('leaf', id(node._operands[0]))
+                if signature not in registers:
+                    registers[signature] = len(leaves)
+                    leaves.append(node._operands[0])
+                compiled[id(node)] = registers[signature]
+                continue
+            if not ready:
+                stack.append((node, True))
+                stack.extend((operand, False) for operand in reversed(node._operands))
+                continue
+            operands = tuple(compiled[id(operand)] for operand in node._operands)
+            if node._op in ('and', 'or', 'xor'):
+                # commutative, a & b and b & a are the same subexpression
+                operands = tuple(sorted(operands))
+            signature = (node._op, operands)
+            if signature not in registers:
+                registers[signature] = -len(program) - 1
+                left, right = operands if len(operands) == 2 else (operands[0], None)
+                program.append((node._op, left, right))
+            compiled[id(node)] = registers[signature]
+
+        # instructions were numbered -1, -2, ... while leaves were still
+        # being found, now they go after the leaves
+        n_leaves = len(leaves)
+
+        def fix(reg):
+            return reg if reg is None or reg >= 0 else n_leaves - reg - 1
+
+        program = [(op, fix(left), fix(right)) for op, left, right in program]
+        result = fix(compiled[id(self)])
+        if result != n_leaves + len(program) - 1:
+            # the expression is a bare leaf, or its root repeats an earlier
+            # subexpression, copy it into the last register
+            program.append(('or', result, result))
+        return leaves, program
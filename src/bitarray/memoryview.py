@@ -1,10 +1,11 @@
 import copy
-from operator import mul
+from operator import mul, or_, xor
 from functools import reduce
 from typing import Sequence
 from itertools import batched
 
 from bitarray.basearray import BaseArray, getbit, setbit, getbitslice, bytes_iter
+from bitarray.bitarray import BitArray
 
 
 class MemoryView:
@@ -61,6 +62,69 @@ class MemoryView:
                 list(batch)
                 for batch in batched(batches, shape[0])
             ]
+
+
+    def transpose(self) -> 'MemoryView':
+        n_rows, n_cols = self._matrix_shape()
+        return from_rows(transpose_rows(self._rows(), n_cols), n_rows)
+
+
+    def matmul(self, other: 'MemoryView') -> 'MemoryView':
+        return self._product(other, or_)
+
+
+    def __matmul__(self, other: 'MemoryView') -> 'MemoryView':
+        return self.matmul(other)
+
+
+    def gf2_matmul(self, other: 'MemoryView') -> 'MemoryView':
+        return self._product(other, xor)
+
+
+    def gf2_rank(self) -> int:
+        return len(gf2_basis(self._rows()))
+
+
+    def gf2_eliminate(self) -> 'MemoryView':
+        n_rows, n_cols = self._matrix_shape()
+        basis = gf2_basis(self._rows())
+        pivots = sorted(basis)
+        # back substitution, clear every pivot column in all the other rows
+        for i in range(len(pivots) - 1, -1, -1):
+            pivot_row = basis[pivots[i]]
+            for lower in pivots[:i]:
+                if (basis[lower] >> pivots[i]) & 1:
+                    basis[lower] ^= pivot_row
+        rows = [basis[pivot] for pivot in pivots]
+        rows.extend(0 for _ in range(n_rows - len(rows)))
+        return from_rows(rows, n_cols)
+
+
+    def transitive_closure(self) -> 'MemoryView':
+        n_rows, n_cols = self._matrix_shape()
+        if n_rows != n_cols:
+            raise ValueError(f'transitive closure needs a square matrix, got {n_rows}x{n_cols}')
+        return from_rows(closure_rows(self._rows()), n_cols)
+
+
+    def _matrix_shape(self) -> tuple[int, int]:
+        if self.caster is None or len(self.caster.shape) != 2:
+            raise ValueError('matrix operations need a 2-d shape')
+        n_rows, n_cols = self.caster.shape
+        return n_rows, n_cols
+
+
+    def _rows(self) -> list[int]:
+        n_rows, n_cols = self._matrix_shape()
+        return to_rows(self._memoryview, n_rows, n_cols)
+
+
+    def _product(self, other: 'MemoryView', op) -> 'MemoryView':
+        n_rows, n_inner = self._matrix_shape()
+        other_rows, n_cols = other._matrix_shape()
+        if n_inner != other_rows:
+            raise ValueError(f'cannot multiply {n_rows}x{n_inner} by {other_rows}x{n_cols} matrix')
+        return from_rows(product_rows(self._rows(), other._rows(), n_inner, op), n_cols)
             
 
 
@@ -79,3 +143,175 @@ class Caster:
             raise IndexError('one of the dimensions is out of bounds')
         index = sum(i * a for i, a in zip(indices, self.accumulator))
         return index
+
+
+def to_rows(buffer, n_rows: int, n_cols: int) -> list[int]:
+    # every row as an int, in the bit order of toint
+    n_bits = n_rows * n_cols
+    if n_bits == 0:
+        return [0] * n_rows
+    value = int.from_bytes(buffer, 'little') & ((1 << n_bits) - 1)
+    # most significant bit first, so the last row comes first in the string
+    bits = format(value, f'0{n_bits}b')
+    return [
+        int(bits[n_bits - (row + 1) * n_cols:n_bits - row * n_cols] or '0', 2)
+        for row in range(n_rows)
+    ]
+
+
+def from_rows(rows: Sequence[int], n_cols: int) -> MemoryView:
+    n_bits = len(rows) * n_cols
+    bits = ''.join(format(row, f'0{n_cols}b') for row in reversed(rows))
+    value = int(bits, 2) if bits else 0
+    bitarray = BitArray(value.to_bytes((n_bits + 7) // 8, 'little'), n_bits=n_bits)
+    return MemoryView(bitarray, shape=[len(rows), n_cols])
+
+
+def pack_rows(rows: Sequence[int], n_cols: int) -> tuple[bytes, int]:
+    # rows padded to whole bytes, so byte b of every row is bytes_[b::row_bytes]
+    row_bytes = (n_cols + 7) // 8
+    return b''.join(row.to_bytes(row_bytes, 'little') for row in rows), row_bytes
+
+
+# BIT_TABLES[k] maps a byte to b'1' if its bit k is set else to b'0'
+BIT_TABLES = [
+    bytes(ord('1') if (byte >> k) & 1 else ord('0') for byte in range(256))
+    for k in range(8)
+]
+
+
+def transpose_rows(rows: Sequence[int], n_cols: int) -> list[int]:
+    packed, row_bytes = pack_rows(rows, n_cols)
+    return transpose_packed(packed, row_bytes, n_cols)
+
+
+def transpose_packed(packed: bytes, row_bytes: int, n_cols: int) -> list[int]:
+    # packed holds rows of row_bytes bytes each, returns the first
+    # n_cols columns as ints, in the bit order of toint
+    if not packed:
+        return [0] * n_cols
+    columns = []
+    for byte_idx in range(row_bytes):
+        # byte byte_idx of every row, in reverse so the last row is the msb
+        column_bytes = packed[byte_idx::row_bytes][::-1]
+        for k in range(min(8, n_cols - byte_idx * 8)):
+            columns.append(int(column_bytes.translate(BIT_TABLES[k]), 2))
+    return columns
+
+
+def product_rows(a_rows: Sequence[int], b_rows: Sequence[int], n_inner: int, op) -> list[int]:
+    # four russians: for every group of 8 rows of b precompute op over all
+    # 256 subsets, then each row of a picks one subset per byte
+    result = [0] * len(a_rows)
+    packed, row_bytes = pack_rows(a_rows, n_inner)
+    for byte_idx in range(row_bytes):
+        group = b_rows[byte_idx * 8:byte_idx * 8 + 8]
+        table = [0] * 256
+        for subset in range(1, 256):
+            low = subset & -subset
+            k = low.bit_length() - 1
+            table[subset] = op(table[subset ^ low], group[k]) if k < len(group) else table[subset ^ low]
+        for row, byte in enumerate(packed[byte_idx::row_bytes]):
+            if byte:
+                result[row] = op(result[row], table[byte])
+    return result
+
+
+def gf2_basis(rows: Sequence[int]) -> dict[int, int]:
+    # pivot column (lowest set bit) -> row, no two rows share a pivot
+    basis = {}
+    for row in rows:
+        while row:
+            pivot = (row & -row).bit_length() - 1
+            pivot_row = basis.get(pivot)
+            if pivot_row is None:
+                basis[pivot] = row
+                break
+            row ^= pivot_row
+    return basis
+
+
+def closure_rows(rows: Sequence[int]) -> list[int]:
+    # tarjan finds strongly connected components sinks first, so the
+    # reach of a component is its own nodes or-ed with the already
+    # known reach of the components it points to. successors are handled
+    # as row ints, whole groups of them at a time, never listed
+    n = len(rows)
+    index = [-1] * n
+    lowlink = [0] * n
+    component = [-1] * n
+    # nodes reachable from a component, including its own nodes
+    component_reach = []
+    result = [0] * n
+    # nodes in finished components, edges into them need no walking
+    done = 0
+    # the tarjan stack is in index order, prefixes[p] holds stack[:p + 1]
+    # as a mask, so prefixes[-1] is everything on the stack
+    stack = []
+    prefixes = []
+    counter = 0
+
+    def push(node):
+        nonlocal counter
+        index[node] = lowlink[node] = counter
+        counter += 1
+        stack.append(node)
+        prefixes.append((prefixes[-1] if prefixes else 0) | (1 << node))
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        push(root)
+        work = [(root, rows[root])]
+        while work:
+            node, pending = work.pop()
+            # drop every successor finished since this node was last visited
+            pending ^= pending & done
+            on_stack = pending & prefixes[-1]
+            if on_stack:
+                pending ^= on_stack
+                # lowest stack position holding one of them, it has the lowest index
+                low, high = 0, len(stack) - 1
+                while low < high:
+                    mid = (low + high) // 2
+                    if prefixes[mid] & on_stack:
+                        high = mid
+                    else:
+                        low = mid + 1
+                lowlink[node] = min(lowlink[node], index[stack[low]])
+            if pending:
+                # everything left is unvisited
+                child_bit = pending & -pending
+                child = child_bit.bit_length() - 1
+                work.append((node, pending ^ child_bit))
+                push(child)
+                work.append((child, rows[child]))
+                continue
+            if lowlink[node] == index[node]:
+                start = len(stack) - 1
+                while stack[start] != node:
+                    start -= 1
+                members = stack[start:]
+                own = prefixes[-1] ^ (prefixes[start - 1] if start else 0)
+                del stack[start:], prefixes[start:]
+                done |= own
+                out = 0
+                for member in members:
+                    component[member] = len(component_reach)
+                    out |= rows[member]
+                # each step covers a whole successor component, so only
+                # successors not reached yet are ever looked at
+                reach = 0
+                pending = out ^ (out & own)
+                while pending:
+                    child = (pending & -pending).bit_length() - 1
+                    reach |= component_reach[component[child]]
+                    pending ^= pending & reach
+                cyclic = len(members) > 1 or (rows[node] >> node) & 1
+                for member in members:
+                    result[member] = reach | own if cyclic else reach
+                component_reach.append(reach | own)
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+    return result
@@ -140,3 +140,24 @@ def test_bitarray_bitwise_operators_ok():
     result = ba_1 | ba_2
     expected = BitArray('1111101111')
     assert result == expected
+
+
+def test_bitarray_xor_invert_ok():
+    ba_1 = BitArray('1001001111')
+    ba_2 = BitArray('1111100000')
+
+    result = ba_1 ^ ba_2
+    expected = BitArray('0110101111')
+    assert result == expected
+    assert result.n_filled == 7
+
+    result = ~ba_1
+    expected = BitArray('0110110000')
+    assert result == expected
+    assert result.n_filled == 4
+
+
+def test_bitarray_slots_ok():
+    ba = BitArray(16)
+    with pytest.raises(AttributeError):
+        ba.__dict__
@@ -0,0 +1,86 @@
+import pytest
+
+from bitarray.bitarray import BitArray
+from bitarray.bitarraypool import BitArrayPool
+
+
+def test_bitarraypool_ok():
+    pool = BitArrayPool(10, chunk_size=2)
+    assert pool.allocate(3) == range(0, 3)
+    assert pool.add(BitArray('1001001111')) == 3
+    assert len(pool) == 4
+
+    member = pool[3]
+    assert len(member) == 10
+    assert member == BitArray('1001001111')
+    assert member.n_filled == 6
+    assert repr(member) == 'PoolBitArray(nb=10, nf=6, bits=[1, 0, 0, 1, 0, 0, ...])'
+
+    member[1] = 1
+    assert pool[3][1] == 1
+    assert pool[-1].n_filled == 7
+
+    pool[0][9] = 1
+    assert pool[0] == BitArray('0000000001')
+    assert pool[1] == BitArray(10)
+    result = pool[0] & pool[3]
+    assert type(result) is BitArray
+    assert result == BitArray('0000000001')
+    assert type(pool[3][2:6]) is BitArray
+    assert [m.n_filled for m in pool] == [1, 0, 0, 7]
+
+
+def test_bitarraypool_views_survive_growth_ok():
+    pool = BitArrayPool(8, chunk_size=2)
+    pool.allocate(2)
+    member = pool[1]
+    pool.allocate(5)
+    member[0] = 1
+    assert pool[1][0] == 1
+    assert len(pool) == 7
+
+
+def test_bitarraypool_bulk_ok():
+    for n_bits in (10, 64, 128):
+        pool = BitArrayPool(n_bits, chunk_size=3)
+        pool.allocate(7)
+        pool[2][0] = 1
+        pool[5][n_bits - 1] = 1
+
+        mask = BitArray(n_bits)
+        mask[1] = 1
+        mask[n_bits - 1] = 1
+        pool.or_mask(mask)
+        assert pool.counts() == [2, 2, 3, 2, 2, 2, 2]
+        assert all(member[1] == 1 for member in pool)
+
+        pool.xor_mask(mask)
+        assert pool.counts() == [0, 0, 1, 0, 0, 0, 0]
+
+        pool.or_mask(mask)
+        keep = BitArray(n_bits)
+        keep[0] = 1
+        keep[1] = 1
+        pool.and_mask(keep)
+        assert pool.counts() == [1, 1, 2, 1, 1, 1, 1]
+        assert pool[2][0] == 1
+
+
+def test_bitarraypool_fail():
+    pool = BitArrayPool(8)
+    with pytest.raises(IndexError) as err:
+        _ = pool[0]
+    assert str(err.value) == 'BitArrayPool index out of range'
+
+    with pytest.raises(ValueError) as err:
+        pool.add(BitArray('101'))
+    assert str(err.value) == 'array must have 8 bits, got 3'
+
+    with pytest.raises(ValueError) as err:
+        pool.or_mask(BitArray('101'))
+    assert str(err.value) == 'mask must have 8 bits, got 3'
+
+    with pytest.raises(ValueError) as err:
+        pool.allocate(-3)
+    assert str(err.value) == 'n must be non-negative'
+    assert len(pool) == 0
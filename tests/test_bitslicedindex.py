@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from bitarray.bitarray import BitArray
+from bitarray.bitslicedindex import BitSlicedIndex
+
+
+def bitmap(values, predicate):
+    return BitArray(''.join('1' if v is not None and predicate(v) else '0' for v in values))
+
+
+def test_bitslicedindex_ok():
+    values = [5, 0, 3, None, 12, 5, 7]
+    bsi = BitSlicedIndex(values)
+    assert len(bsi) == 7
+    assert len(bsi.slices) == 4
+    assert bsi.ebm == BitArray('1110111')
+    assert [bsi[i] for i in range(len(bsi))] == values
+
+    assert bsi.eq(5) == BitArray('1000010')
+    assert bsi.ne(5) == BitArray('0110101')
+    assert bsi.lt(5) == BitArray('0110000')
+    assert bsi.le(5) == BitArray('1110010')
+    assert bsi.gt(5) == BitArray('0000101')
+    assert bsi.ge(5) == BitArray('1000111')
+    assert bsi.between(3, 7) == BitArray('1010011')
+    assert bsi.eq(100) == BitArray('0000000')
+    assert bsi.lt(100) == BitArray('1110111')
+    assert bsi.gt(-1) == BitArray('1110111')
+
+    assert bsi.sum() == 32
+    assert bsi.sum(bsi.lt(6)) == 13
+
+
+def test_bitslicedindex_top_k_ok():
+    bsi = BitSlicedIndex([5, 0, 3, None, 12, 5, 7])
+    assert bsi.top_k(0) == BitArray('0000000')
+    assert bsi.top_k(1) == BitArray('0000100')
+    assert bsi.top_k(2) == BitArray('0000101')
+    # a tie on 5, the lowest row wins
+    assert bsi.top_k(3) == BitArray('1000101')
+    assert bsi.top_k(4) == BitArray('1000111')
+    assert bsi.top_k(10) == BitArray('1110111')
+
+
+def test_bitslicedindex_append_ok():
+    bsi = BitSlicedIndex([1, 2])
+    assert bsi.eq(2) == BitArray('01')
+    assert bsi.ebm == BitArray('11')
+
+    bsi.append(300)
+    bsi.append(None)
+    bsi.extend([2, 0])
+    assert len(bsi) == 6
+    assert len(bsi.slices) == 9
+    assert bsi.slices[8] == BitArray('001000')
+    assert bsi.ebm == BitArray('111011')
+    assert bsi.eq(2) == BitArray('010010')
+    assert bsi.gt(2) == BitArray('001000')
+    assert bsi[2] == 300
+    assert bsi[3] is None
+
+
+def test_bitslicedindex_bitmaps_copy_ok():
+    bsi = BitSlicedIndex([3, 1])
+    ebm = bsi.ebm
+    ebm[0] = 0
+    slices = bsi.slices
+    slices[0][1] = 0
+    assert bsi.ebm == BitArray('11')
+    assert bsi.slices[0] == BitArray('11')
+    assert bsi.eq(1) == BitArray('01')
+
+
+def test_bitslicedindex_random_ok():
+    rng = random.Random(0)
+    values = [rng.choice([None, rng.randrange(1000), rng.randrange(1 << 70)]) for _ in range(200)]
+    bsi = BitSlicedIndex(values[:150])
+    bsi.extend(values[150:])
+    for c in [0, 17, 500, 999, 1 << 69]:
+        assert bsi.eq(c) == bitmap(values, lambda v: v == c)
+        assert bsi.lt(c) == bitmap(values, lambda v: v < c)
+        assert bsi.ge(c) == bitmap(values, lambda v: v >= c)
+        assert bsi.between(c, c * 3) == bitmap(values, lambda v: c <= v <= c * 3)
+    assert bsi.sum() == sum(v for v in values if v is not None)
+    top = bsi.top_k(20)
+    assert top.n_filled == 20
+    threshold = sorted((v for v in values if v is not None), reverse=True)[19]
+    assert all(values[i] >= threshold for i, bit in enumerate(top) if bit)
+
+
+def test_bitslicedindex_fail():
+    with pytest.raises(ValueError) as err:
+        _ = BitSlicedIndex([1, -2])
+    assert str(err.value) == 'BitSlicedIndex values must be non-negative'
+
+    bsi = BitSlicedIndex([1, 2])
+    with pytest.raises(IndexError) as err:
+        _ = bsi[2]
+    assert str(err.value) == 'BitSlicedIndex index out of range'
+
+    with pytest.raises(TypeError) as err:
+        _ = BitSlicedIndex([1.5])
+    assert str(err.value) == 'BitSlicedIndex values are ints, got float'
+    with pytest.raises(TypeError) as err:
+        bsi.extend([3, '4'])
+    assert str(err.value) == 'BitSlicedIndex values are ints, got str'
+    with pytest.raises(TypeError) as err:
+        bsi.eq(1.5)
+    assert str(err.value) == 'BitSlicedIndex values are ints, got float'
+    assert len(bsi) == 2
+    assert bsi.eq(2) == BitArray('01')
@@ -0,0 +1,95 @@
+import random
+import threading
+
+import pytest
+
+from bitarray.concurrentbitarray import ConcurrentBitArray
+
+
+def test_concurrentbitarray_ok():
+    ba = ConcurrentBitArray(16, stripe_bytes=1, n_stripes=2)
+    assert len(ba) == 16
+    assert ba[1] == 0
+    ba[1] = 1
+    ba[9] = 1
+    assert ba[1] == 1
+    assert ba.n_filled == 2
+    ba[-1] = 1
+    assert ba[15] == 1
+    assert ba.n_filled == 3
+    assert ba.is_full() is False
+
+    ba = ConcurrentBitArray('1001001111')
+    assert ba.n_filled == 6
+    assert repr(ba) == 'ConcurrentBitArray(nb=10, nf=6, bits=[1, 0, 0, 1, 0, 0, ...])'
+
+
+def test_concurrentbitarray_test_and_set_ok():
+    ba = ConcurrentBitArray(10)
+    assert ba.test_and_set(3) == 0
+    assert ba.test_and_set(3) == 1
+    assert ba[3] == 1
+    assert ba.n_filled == 1
+
+    assert ba.test_and_clear(3) == 1
+    assert ba.test_and_clear(3) == 0
+    assert ba[3] == 0
+    assert ba.n_filled == 0
+
+
+def test_concurrentbitarray_update_ok():
+    ba = ConcurrentBitArray(100, stripe_bytes=2, n_stripes=3)
+    ba.update((i, 1) for i in range(0, 100, 3))
+    assert ba.n_filled == 34
+    ba.update([(0, 0), (1, 1), (3, 1)])
+    assert ba[0] == 0
+    assert ba[1] == 1
+    assert ba.n_filled == 34
+
+
+def test_concurrentbitarray_slice_assignment_ok():
+    ba = ConcurrentBitArray('11111110000000', stripe_bytes=1)
+    ba[3:11] = ConcurrentBitArray('00001111')
+    assert ba == ConcurrentBitArray('11100001111000')
+    assert ba.n_filled == 7
+
+
+def test_concurrentbitarray_threads_ok():
+    n_bits = 4096
+    ba = ConcurrentBitArray(n_bits, stripe_bytes=8, n_stripes=4)
+    winners = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        won = 0
+        for _ in range(2000):
+            won += 1 - ba.test_and_set(rng.randrange(n_bits))
+        winners.append(won)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # every bit was won by exactly one thread
+    assert sum(winners) == ba.n_filled == sum(ba)
+
+
+def test_concurrentbitarray_fail():
+    ba = ConcurrentBitArray(8)
+    with pytest.raises(IndexError) as err:
+        ba[8] = 1
+    assert str(err.value) == 'bit array index out of range'
+
+    with pytest.raises(IndexError) as err:
+        ba.test_and_set(-9)
+    assert str(err.value) == 'bit array index out of range'
+
+    with pytest.raises(ValueError) as err:
+        ba.update([(1, 2)])
+    assert str(err.value) == 'It is a bit array, value can only be set to 0 or 1.'
+
+    with pytest.raises(ValueError) as err:
+        _ = ConcurrentBitArray(8, n_stripes=0)
+    assert str(err.value) == 'stripe_bytes and n_stripes must be positive'
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from bitarray.frozenbitarray import FrozenBitArray
+from bitarray.fingerprint import hamming, jaccard, FingerprintIndex
+
+
+def random_fingerprint(rng, n_bits):
+    return FrozenBitArray(''.join(rng.choice('01') for _ in range(n_bits)))
+
+
+def test_hamming_ok():
+    fp_1 = FrozenBitArray('1001001111')
+    fp_2 = FrozenBitArray('1111100000')
+    assert hamming(fp_1, fp_2) == 7
+    assert hamming(fp_1, fp_1) == 0
+
+
+def test_jaccard_ok():
+    fp_1 = FrozenBitArray('1001001111')
+    fp_2 = FrozenBitArray('1111100000')
+    assert jaccard(fp_1, fp_2) == 2 / 9
+    assert jaccard(fp_1, fp_1) == 1.0
+    assert jaccard(FrozenBitArray('0000'), FrozenBitArray('0000')) == 1.0
+
+
+def test_hamming_fail():
+    with pytest.raises(ValueError) as err:
+        hamming(FrozenBitArray('10'), FrozenBitArray('100'))
+    assert str(err.value) == 'arrays must have the same length, got 2 and 3'
+
+
+def test_fingerprintindex_ok():
+    fps = [
+        FrozenBitArray('1111000011110000'),
+        FrozenBitArray('1111000011110001'),
+        FrozenBitArray('0000111100001111'),
+    ]
+    index = FingerprintIndex(16, fps)
+    assert len(index) == 3
+    assert index[1] == fps[1]
+    assert index[-1] == fps[2]
+
+    query = FrozenBitArray('1111000011110000')
+    assert index.distances(query) == [0, 1, 16]
+    assert index.query(query, 2) == [(0, 0), (1, 1)]
+    assert index.within(query, 1) == [(0, 0), (1, 1)]
+    assert index.within(query, 0) == [(0, 0)]
+
+    assert index.add(FrozenBitArray('1111000011110011')) == 3
+    assert index.query(query, 3) == [(0, 0), (1, 1), (3, 2)]
+
+
+def test_fingerprintindex_segments_ok():
+    rng = random.Random(0)
+    fps = [random_fingerprint(rng, 64) for _ in range(300)]
+    # add near duplicates so small radii have matches
+    for fp in fps[:20]:
+        bits = ''.join(str(bit) for bit in fp)
+        fps.append(FrozenBitArray(bits[:-3] + '000'))
+    scan = FingerprintIndex(64, fps)
+    mih = FingerprintIndex(64, fps, n_segments=4)
+
+    for query in fps[:30]:
+        for radius in range(6):
+            assert mih.within(query, radius) == scan.within(query, radius)
+
+
+def test_fingerprintindex_distances_ok():
+    rng = random.Random(0)
+    # record sizes that are and are not a power of two bytes
+    for n_bits in (3, 8, 40, 136, 256, 520):
+        fps = [random_fingerprint(rng, n_bits) for _ in range(50)]
+        fps += [FrozenBitArray('0' * n_bits), FrozenBitArray('1' * n_bits)]
+        index = FingerprintIndex(n_bits, fps)
+        assert bytes(index) == b''.join(bytes(fp._bytes) for fp in fps)
+        for query in fps[-3:]:
+            assert index.distances(query) == [hamming(query, fp) for fp in fps]
+
+
+def test_fingerprintindex_fail():
+    index = FingerprintIndex(8)
+    with pytest.raises(ValueError) as err:
+        index.add(FrozenBitArray('101'))
+    assert str(err.value) == 'fingerprint must have 8 bits, got 3'
+
+    with pytest.raises(IndexError) as err:
+        _ = index[0]
+    assert str(err.value) == 'FingerprintIndex index out of range'
+
+    with pytest.raises(ValueError) as err:
+        FingerprintIndex(8, n_segments=9)
+    assert str(err.value) == 'n_segments must be in range(1, 9)'
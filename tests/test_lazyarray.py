@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+from bitarray.bitarray import BitArray
+from bitarray.frozenbitarray import FrozenBitArray
+from bitarray.bitarraypool import BitArrayPool
+from bitarray import lazyarray
+from bitarray.lazyarray import lazy, LazyArray
+
+
+def random_bitarray(rng, n_bits):
+    return BitArray(''.join(rng.choice('01') for _ in range(n_bits)))
+
+
+def test_lazyarray_ok():
+    a = BitArray('1001001111')
+    b = BitArray('1111100000')
+    c = BitArray('0101010101')
+    d = BitArray('0011001100')
+
+    expr = (lazy(a) & b) | (c & ~lazy(d))
+    assert isinstance(expr, LazyArray)
+    expected = (a & b) | (c & ~d)
+    assert len(expr) == 10
+    assert expr.materialize() == expected
+    assert expr.n_filled == expected.n_filled
+    assert list(expr) == list(expected)
+    assert [expr[i] for i in range(10)] == list(expected)
+    assert expr[-1] == expected[9]
+    assert expr.is_full() is False
+
+    # inputs are read when the expression is evaluated, not when it is built
+    a[1] = 1
+    assert expr.materialize() == (a & b) | (c & ~d)
+
+
+def test_lazyarray_mixed_operands_ok():
+    a = FrozenBitArray('1001001111')
+    b = FrozenBitArray('1111100000')
+    expr = a ^ lazy(b)
+    assert isinstance(expr, LazyArray)
+    result = expr.materialize()
+    assert isinstance(result, FrozenBitArray)
+    assert result == a ^ b
+    assert (~lazy(a)).materialize() == ~a
+    assert lazy(a).materialize() == a
+
+
+def test_lazyarray_slicing_ok():
+    rng = random.Random(0)
+    a, b, c = (random_bitarray(rng, 50) for _ in range(3))
+    expr = (lazy(a) | b) & ~lazy(c)
+    expected = list((a | b) & ~c)
+    for key in [slice(None), slice(3, 17), slice(8, 16), slice(5, 45, 3), slice(40, 2, -4), slice(30, 30)]:
+        result = expr[key]
+        assert list(result) == expected[key]
+        assert result.n_filled == sum(expected[key])
+
+
+def test_lazyarray_chunks_ok(monkeypatch):
+    monkeypatch.setattr(lazyarray, 'CHUNK_BYTES', 3)
+    rng = random.Random(1)
+    arrays = [random_bitarray(rng, 203) for _ in range(5)]
+    expr = lazy(arrays[0])
+    expected = arrays[0]
+    for i, arr in enumerate(arrays[1:]):
+        if i % 2:
+            expr, expected = expr & ~lazy(arr), expected & ~arr
+        else:
+            expr, expected = expr | arr, expected | arr
+    assert expr.materialize() == expected
+    assert expr.n_filled == expected.n_filled
+    assert list(expr) == list(expected)
+    assert list(expr[17:190]) == list(expected)[17:190]
+
+
+def test_lazyarray_common_subexpressions_ok():
+    a = BitArray('1001001111')
+    b = BitArray('1111100000')
+    c = BitArray('0101010101')
+    expr = ((lazy(a) & b) | c) ^ ((lazy(b) & a) | c)
+    leaves, program = expr._compile()
+    assert leaves == [a, b, c]
+    # a & b, | c, then the xor of it with itself
+    assert len(program) == 3
+    assert expr.n_filled == 0
+
+
+def test_lazyarray_of_lazyarray_ok():
+    a = BitArray('1100')
+    b = BitArray('1010')
+    expr = lazy(a) & b
+    assert lazy(expr) is expr
+    assert lazy(lazy(expr) | a).materialize() == (a & b) | a
+
+
+def test_lazyarray_eq_ok():
+    a = BitArray('1100')
+    b = BitArray('1010')
+    assert lazy(a) == lazy(a)
+    assert lazy(a) & b == lazy(b) & a
+    assert lazy(a) != lazy(b)
+    assert a == lazy(a)
+    assert lazy(a) == a
+    assert a != lazy(b)
+    assert (a & b) == lazy(a) & b
+    assert lazy(a) != '1100'
+    assert a != '1100'
+
+
+def test_lazyarray_fail():
+    with pytest.raises(ValueError) as err:
+        _ = lazy(BitArray('101')) & BitArray('1010')
+    assert str(err.value) == 'arrays must have the same length, got 3 and 4'
+
+    with pytest.raises(IndexError) as err:
+        _ = lazy(BitArray('101'))[3]
+    assert str(err.value) == 'LazyArray index out of range'
+
+    with pytest.raises(TypeError):
+        _ = lazy(BitArray('101')) & 5
+
+    with pytest.raises(TypeError) as err:
+        _ = lazy('101')
+    assert str(err.value) == 'lazy() takes a BaseArray, got str'
+
+
+def test_lazyarray_pool_member_ok():
+    pool = BitArrayPool(10)
+    pool.add(BitArray('1001001111'))
+    b = BitArray('1111100000')
+    expr = lazy(pool[0]) & b
+    result = expr.materialize()
+    assert type(result) is BitArray
+    assert result == BitArray('1001000000')
+    assert type(expr[2:8]) is BitArray
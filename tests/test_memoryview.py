@@ -1,3 +1,7 @@
+import operator
+import random
+from functools import reduce
+
 import pytest
 
 from bitarray.bitarray import BitArray
@@ -93,3 +97,112 @@ def test_memoryview_tolist():
         ],
     ]
     assert ba_list == expected
+
+
+def random_matrix(rng, n_rows, n_cols, density=0.3):
+    bits = ''.join('1' if rng.random() < density else '0' for _ in range(n_rows * n_cols))
+    return MemoryView(BitArray(bits), shape=[n_rows, n_cols])
+
+
+def naive_matmul(a, b, add):
+    return [
+        [
+            int(reduce(add, (x & y for x, y in zip(row, col)), 0))
+            for col in zip(*b)
+        ]
+        for row in a
+    ]
+
+
+def naive_gf2_rank(rows):
+    rows = [row[:] for row in rows]
+    rank = 0
+    for col in range(len(rows[0])):
+        pivot = next((r for r in range(rank, len(rows)) if rows[r][col]), None)
+        if pivot is None:
+            continue
+        rows[rank], rows[pivot] = rows[pivot], rows[rank]
+        for r in range(len(rows)):
+            if r != rank and rows[r][col]:
+                rows[r] = [x ^ y for x, y in zip(rows[r], rows[rank])]
+        rank += 1
+    return rank, rows
+
+
+def naive_closure(rows):
+    n = len(rows)
+    reach = [row[:] for row in rows]
+    for k in range(n):
+        for i in range(n):
+            if reach[i][k]:
+                reach[i] = [x | y for x, y in zip(reach[i], reach[k])]
+    return reach
+
+
+def test_memoryview_transpose_ok():
+    ba = BitArray('111111000000')
+    mv = MemoryView(ba, shape=[2, 6])
+    expected = [[1, 0]] * 6
+    assert mv.transpose().tolist() == expected
+
+    rng = random.Random(0)
+    for n_rows, n_cols in [(1, 1), (3, 5), (9, 17), (16, 8)]:
+        mv = random_matrix(rng, n_rows, n_cols)
+        expected = [list(col) for col in zip(*mv.tolist())]
+        assert mv.transpose().tolist() == expected
+
+
+def test_memoryview_matmul_ok():
+    rng = random.Random(1)
+    for n, m, p in [(2, 3, 4), (7, 9, 5), (13, 20, 11)]:
+        a = random_matrix(rng, n, m)
+        b = random_matrix(rng, m, p)
+        assert (a @ b).tolist() == naive_matmul(a.tolist(), b.tolist(), operator.or_)
+        assert a.gf2_matmul(b).tolist() == naive_matmul(a.tolist(), b.tolist(), operator.xor)
+
+
+def test_memoryview_gf2_ok():
+    rng = random.Random(2)
+    for n_rows, n_cols in [(3, 3), (6, 10), (12, 7), (10, 10)]:
+        mv = random_matrix(rng, n_rows, n_cols, density=0.5)
+        rank, reduced = naive_gf2_rank(mv.tolist())
+        assert mv.gf2_rank() == rank
+        assert mv.gf2_eliminate().tolist() == reduced
+
+    identity = MemoryView(BitArray('100010001'), shape=[3, 3])
+    assert identity.gf2_rank() == 3
+
+
+def test_memoryview_transitive_closure_ok():
+    # 0 -> 1 -> 2, 3 <-> 4
+    ba = BitArray('0100000100000000000100010')
+    mv = MemoryView(ba, shape=[5, 5])
+    expected = [
+        [0, 1, 1, 0, 0],
+        [0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 1],
+        [0, 0, 0, 1, 1],
+    ]
+    assert mv.transitive_closure().tolist() == expected
+
+    rng = random.Random(3)
+    for n, density in [(1, 0.08), (6, 0.08), (15, 0.08), (30, 0.08), (30, 0.5), (40, 0.03)]:
+        mv = random_matrix(rng, n, n, density=density)
+        assert mv.transitive_closure().tolist() == naive_closure(mv.tolist())
+
+
+def test_memoryview_matrix_fail():
+    ba = BitArray('111111000000')
+    with pytest.raises(ValueError) as err:
+        MemoryView(ba, shape=[2, 2, 3]).transpose()
+    assert str(err.value) == 'matrix operations need a 2-d shape'
+
+    mv = MemoryView(ba, shape=[2, 6])
+    with pytest.raises(ValueError) as err:
+        mv @ mv
+    assert str(err.value) == 'cannot multiply 2x6 by 2x6 matrix'
+
+    with pytest.raises(ValueError) as err:
+        mv.transitive_closure()
+    assert str(err.value) == 'transitive closure needs a square matrix, got 2x6'